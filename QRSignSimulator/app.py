@@ -2,6 +2,7 @@
 动态签到码模拟生成器应用程序入口
 """
 
+import argparse
 import tkinter as tk
 import sys
 import os
@@ -9,18 +10,34 @@ import os
 # 确保可以导入模块
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from QRSignSimulator.config.settings import Settings
 from QRSignSimulator.ui.main_window import MainWindow
 
 
-def main():
+def main(argv=None):
     """应用程序主入口"""
+    arg_parser = argparse.ArgumentParser(description="动态签到码模拟生成器")
+    arg_parser.add_argument("--config", help="JSON配置文件路径（也可通过 QRSIGN_CONFIG 环境变量指定）")
+    arg_parser.add_argument("--profile", type=float, metavar="SECONDS",
+                            help="启动后立即进行指定秒数的性能采样分析")
+    args = arg_parser.parse_args(argv)
+    
+    # 加载设置：默认值 → 配置文件 → 环境变量
+    try:
+        settings = Settings.load(args.config)
+    except (ValueError, OSError) as e:
+        print(f"配置错误: {str(e)}")
+        return 2
+    
     # 创建主窗口
     root = tk.Tk()
-    app = MainWindow(root)
+    app = MainWindow(root, settings)
+    if args.profile:
+        app.toggle_profiling(args.profile)
     
     # 启动事件循环
     root.mainloop()
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
@@ -1,7 +1,16 @@
 """
 应用程序配置文件
+
+模块常量为各项设置的默认值；运行时使用的设置由 Settings 对象承载，
+按 默认值 → 配置文件 → 环境变量 的顺序加载，并传入各个组件。
 """
 
+import json
+import os
+from dataclasses import dataclass, fields, replace
+
+import pytz
+
 # 应用程序设置
 APP_TITLE = "动态签到码模拟生成器"
 APP_WIDTH = 800
@@ -10,22 +19,182 @@ APP_HEIGHT = 600
 # 二维码设置
 QR_VERSION = 1
 QR_ERROR_CORRECTION = "L"  # L, M, Q, H
-QR_BOX_SIZE = 10
+QR_BOX_SIZE = 10  # 窗口布局完成前的模块像素边长上限；布局完成后按显示区域大小绘制
 QR_BORDER = 4
 QR_FILL_COLOR = "black"
 QR_BACK_COLOR = "white"
 
+# 解码设置
+DECODE_RACE = True  # 是否并发运行多个检测器竞速解码（否则仅使用pyzbar）
+DECODE_RACE_WORKERS = 2  # 竞速解码线程池大小
+DECODE_RACE_TIMEOUT = 5.0  # 竞速解码超时（秒）
+LEAN_MODE = False  # 精简模式：不预加载OpenCV，仅在pyzbar解码失败时按需加载OpenCV检测器
+
 # 图像设置
-IMAGE_MAX_WIDTH = 600
+IMAGE_MAX_WIDTH = 600  # 窗口布局完成前的二维码最大显示尺寸，以及剪贴板图片的最大显示尺寸
 IMAGE_MAX_HEIGHT = 400
+REPAINT_FULL_THRESHOLD = 0.35  # 相邻两帧变化面积占比超过该值时整幅重绘
+REPAINT_MAX_RECTS = 128  # 变化矩形数量超过该值时整幅重绘
+RENDER_CACHE_SIZE = 3  # 缓存的二维码显示尺寸数量
+RESIZE_DEBOUNCE_MS = 150  # 调整窗口大小后等待多久再重绘（毫秒）
 
 # 时间设置
 TIME_ZONE = 'Asia/Shanghai'
 UPDATE_INTERVAL = 5  # 更新间隔（秒）
 REFRESH_RATE = 0.1  # 刷新率（秒）
 
+# 性能分析设置
+PROFILE_DURATION = 10.0  # 每次采样分析的时长（秒）
+PROFILE_OUTPUT_DIR = "profiles"  # 分析结果输出目录
+PROFILE_HOTKEY = "<F9>"  # 主窗口中开始/结束采样分析的快捷键
+
 # 签到二维码设置
 QR_TEMPLATE = "checkwork|id={id}&siteId={site_id}&createTime={create_time}&classLessonId={class_lesson_id}"
 ID_LENGTH = 19  # ID长度
 CLASS_LESSON_ID_LENGTH = 19  # 课程ID长度
-DEFAULT_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"  # 默认时间格式 
\ No newline at end of file
+DEFAULT_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"  # 默认时间格式 
+
+# 配置文件和环境变量
+CONFIG_ENV_VAR = "QRSIGN_CONFIG"  # 指定配置文件路径的环境变量
+ENV_PREFIX = "QRSIGN_"  # 设置项环境变量前缀，如 QRSIGN_QR_BOX_SIZE=8
+
+
+@dataclass(frozen=True)
+class Settings:
+    """运行时可调整的设置
+
+    字段名与上方的模块常量一一对应（小写），默认值取自模块常量。
+    """
+
+    qr_version: int = QR_VERSION
+    qr_error_correction: str = QR_ERROR_CORRECTION
+    qr_box_size: int = QR_BOX_SIZE
+    qr_border: int = QR_BORDER
+    qr_fill_color: str = QR_FILL_COLOR
+    qr_back_color: str = QR_BACK_COLOR
+    decode_race: bool = DECODE_RACE
+    decode_race_workers: int = DECODE_RACE_WORKERS
+    decode_race_timeout: float = DECODE_RACE_TIMEOUT
+    lean_mode: bool = LEAN_MODE
+    image_max_width: int = IMAGE_MAX_WIDTH
+    image_max_height: int = IMAGE_MAX_HEIGHT
+    repaint_full_threshold: float = REPAINT_FULL_THRESHOLD
+    repaint_max_rects: int = REPAINT_MAX_RECTS
+    render_cache_size: int = RENDER_CACHE_SIZE
+    resize_debounce_ms: int = RESIZE_DEBOUNCE_MS
+    time_zone: str = TIME_ZONE
+    update_interval: float = UPDATE_INTERVAL
+    refresh_rate: float = REFRESH_RATE
+    profile_duration: float = PROFILE_DURATION
+    profile_output_dir: str = PROFILE_OUTPUT_DIR
+
+    def __post_init__(self):
+        if self.qr_error_correction not in ("L", "M", "Q", "H"):
+            raise ValueError(f"无效的纠错级别: {self.qr_error_correction}")
+        if not 1 <= self.qr_version <= 40:
+            raise ValueError(f"qr_version 必须在1到40之间: {self.qr_version}")
+        for name in ("qr_box_size", "decode_race_workers", "decode_race_timeout", "image_max_width",
+                     "image_max_height", "render_cache_size", "update_interval", "refresh_rate",
+                     "profile_duration"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} 必须为正数: {getattr(self, name)}")
+        for name in ("qr_border", "repaint_max_rects", "resize_debounce_ms"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} 不能为负数: {getattr(self, name)}")
+        if not 0 <= self.repaint_full_threshold <= 1:
+            raise ValueError(f"repaint_full_threshold 必须在0到1之间: {self.repaint_full_threshold}")
+        try:
+            pytz.timezone(self.time_zone)
+        except pytz.UnknownTimeZoneError:
+            raise ValueError(f"未知的时区: {self.time_zone}")
+
+    @classmethod
+    def field_names(cls):
+        """获取所有设置项名称
+
+        Returns:
+            list: 设置项名称列表
+        """
+        return [f.name for f in fields(cls)]
+
+    @classmethod
+    def coerce(cls, name, value):
+        """将字符串等输入转换为设置项声明的类型
+
+        Args:
+            name: 设置项名称
+            value: 原始值
+
+        Returns:
+            转换后的值
+        """
+        field_types = {f.name: f.type for f in fields(cls)}
+        if name not in field_types:
+            raise ValueError(f"未知的设置项: {name}")
+
+        field_type = field_types[name]
+        if field_type in (bool, "bool"):
+            if isinstance(value, str):
+                lowered = value.strip().lower()
+                if lowered in ("1", "true", "yes", "on"):
+                    return True
+                if lowered in ("0", "false", "no", "off"):
+                    return False
+                raise ValueError(f"{name} 需要布尔值: {value}")
+            return bool(value)
+        if field_type in (int, "int"):
+            # 拒绝非整数值（如配置文件中的 8.9），而不是静默截断
+            if isinstance(value, float) and not value.is_integer():
+                raise ValueError(f"{name} 需要整数: {value}")
+            try:
+                return int(value)
+            except ValueError:
+                raise ValueError(f"{name} 需要整数: {value}")
+        if field_type in (float, "float"):
+            return float(value)
+        return str(value)
+
+    def with_overrides(self, **overrides):
+        """基于当前设置创建修改了部分设置项的新对象
+
+        Args:
+            **overrides: 要修改的设置项
+
+        Returns:
+            Settings: 新的设置对象
+        """
+        return replace(self, **{name: self.coerce(name, value) for name, value in overrides.items()})
+
+    @classmethod
+    def load(cls, config_path=None, environ=None):
+        """按 默认值 → 配置文件 → 环境变量 的顺序加载设置
+
+        Args:
+            config_path: JSON配置文件路径，可选；未指定时读取 QRSIGN_CONFIG 环境变量
+            environ: 环境变量字典，默认为 os.environ
+
+        Returns:
+            Settings: 设置对象
+        """
+        if environ is None:
+            environ = os.environ
+
+        overrides = {}
+
+        config_path = config_path or environ.get(CONFIG_ENV_VAR)
+        if config_path:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 配置文件中的键不区分大小写，可直接使用模块常量名
+            overrides.update({key.lower(): value for key, value in data.items()})
+
+        for name in cls.field_names():
+            env_value = environ.get(ENV_PREFIX + name.upper())
+            if env_value is not None:
+                overrides[name] = env_value
+
+        return cls().with_overrides(**overrides)
+
+
+# 默认设置对象，未显式传入设置的组件使用该对象
+DEFAULT_SETTINGS = Settings()
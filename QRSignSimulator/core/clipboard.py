@@ -5,7 +5,8 @@
 
 from PIL import ImageGrab, Image
 import numpy as np
-import cv2
+
+from QRSignSimulator.utils import image_ops
 
 
 class ClipboardManager:
@@ -42,8 +43,7 @@ class ClipboardManager:
             img_array = np.array(clipboard_img)
             
             # 如果是RGBA图像，转换为RGB
-            if len(img_array.shape) == 3 and img_array.shape[2] == 4:
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
+            img_array = image_ops.rgba_to_rgb(img_array)
             
             return clipboard_img, img_array
             
@@ -0,0 +1,241 @@
+"""
+多检测器竞速解码模块
+在小线程池中并发运行多个二维码检测器，返回最先得到的有效结果
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from pyzbar.pyzbar import decode as pyzbar_decode
+
+from QRSignSimulator.utils.image_ops import get_cv2
+
+
+def _decode_pyzbar(gray):
+    """使用pyzbar解码"""
+    for obj in pyzbar_decode(gray):
+        return obj.data.decode('utf-8')
+    return None
+
+
+def _make_opencv_decoder(detector_cls):
+    """构造基于OpenCV检测器的解码函数
+
+    OpenCV检测器对象不是线程安全的，每个线程各自持有一个实例
+    """
+    local = threading.local()
+
+    def _decode(gray):
+        detector = getattr(local, "detector", None)
+        if detector is None:
+            detector = local.detector = detector_cls()
+        data, _, _ = detector.detectAndDecode(gray)
+        return data or None
+
+    return _decode
+
+
+def opencv_detectors():
+    """获取OpenCV提供的检测器，调用时才导入OpenCV
+
+    Returns:
+        dict: 检测器名称 -> 解码函数，未安装OpenCV时为空字典
+    """
+    cv2 = get_cv2()
+    detectors = {}
+    if cv2 is None:
+        return detectors
+    if hasattr(cv2, "QRCodeDetector"):
+        detectors["opencv"] = _make_opencv_decoder(cv2.QRCodeDetector)
+    if hasattr(cv2, "QRCodeDetectorAruco"):
+        detectors["opencv_aruco"] = _make_opencv_decoder(cv2.QRCodeDetectorAruco)
+    return detectors
+
+
+def available_detectors(include_opencv=True):
+    """获取当前环境下可用的检测器
+
+    Args:
+        include_opencv: 是否包含OpenCV检测器（会导入OpenCV）
+
+    Returns:
+        dict: 检测器名称 -> 解码函数 (输入灰度图，返回字符串或None)
+    """
+    detectors = {"pyzbar": _decode_pyzbar}
+    if include_opencv:
+        detectors.update(opencv_detectors())
+    return detectors
+
+
+class DetectorStats:
+    """单个检测器的统计信息"""
+
+    def __init__(self):
+        self.runs = 0
+        self.successes = 0
+        self.wins = 0
+        self.total_latency = 0.0
+
+    @property
+    def win_rate(self):
+        return self.wins / self.runs if self.runs else 0.0
+
+    @property
+    def avg_latency(self):
+        return self.total_latency / self.runs if self.runs else 0.0
+
+
+class DecoderRace:
+    """多检测器竞速解码类
+
+    所有检测器共享同一个预处理后的灰度缓冲区；pyzbar和OpenCV都在本地代码中释放GIL，
+    因此可以在线程池中真正并行。第一个返回有效结果的检测器获胜，尚未开始的任务被取消，
+    仍在运行的任务结果被忽略。按胜率和平均耗时对检测器排序，决定下次的提交顺序。
+
+    已开始的检测器无法中断，会一直占用线程池线程直到结束。下次解码时先只运行空闲的检测器，
+    避免新任务排在旧任务之后；它们全部失败时再提交上次仍未结束的检测器，排队等待其结束后运行。
+
+    指定 fallback_loader 时，所有检测器都失败后才调用它加载后备检测器（如OpenCV）并再试一次；
+    加载后的后备检测器此后与其他检测器一同参与竞速。
+    """
+
+    def __init__(self, detectors=None, max_workers=2, timeout=5.0, fallback_loader=None):
+        """初始化
+
+        Args:
+            detectors: 检测器字典 (名称 -> 解码函数)，默认为所有可用检测器
+            max_workers: 线程池大小，小于检测器数量时排名靠前的检测器优先运行
+            timeout: 单次解码的最长等待时间（秒）
+            fallback_loader: 返回后备检测器字典的函数，可选
+        """
+        self.detectors = detectors if detectors is not None else available_detectors()
+        self.timeout = timeout
+        self.fallback_loader = fallback_loader
+        self.stats = {name: DetectorStats() for name in self.detectors}
+        self._lock = threading.Lock()
+        # 检测器名称 -> 最近一次提交的任务，用于跳过仍在运行的检测器
+        self._in_flight = {}
+        # 线程池按最大可能的检测器数量创建，线程只在需要时才启动
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="qr-decode"
+        )
+
+    def ranked_detectors(self):
+        """按胜率（高优先）和平均耗时（低优先）排序的检测器名称列表"""
+        with self._lock:
+            return sorted(
+                self.detectors,
+                key=lambda name: (-self.stats[name].win_rate, self.stats[name].avg_latency)
+            )
+
+    def _run(self, name, gray):
+        """在工作线程中运行单个检测器并记录耗时"""
+        start = time.perf_counter()
+        try:
+            result = self.detectors[name](gray)
+        except Exception as e:
+            print(f"检测器 {name} 解码错误: {str(e)}")
+            result = None
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            stats = self.stats[name]
+            stats.runs += 1
+            stats.total_latency += elapsed
+            if result:
+                stats.successes += 1
+        return name, result
+
+    def decode(self, gray):
+        """竞速解码
+
+        Args:
+            gray: 灰度图像 (numpy.ndarray)
+
+        Returns:
+            str: 最先解码得到的二维码数据，全部失败或超时则返回None
+        """
+        names = self.ranked_detectors()
+        busy = [name for name in names if name in self._in_flight and not self._in_flight[name].done()]
+        idle = [name for name in names if name not in busy]
+        result = self._race(gray, idle or busy)
+        if result is None and idle and busy:
+            result = self._race(gray, busy)
+        if result is None and self.fallback_loader is not None:
+            fallback = self._load_fallback()
+            if fallback:
+                result = self._race(gray, fallback)
+        return result
+
+    def _load_fallback(self):
+        """加载后备检测器并加入竞速
+
+        Returns:
+            list: 新加入的检测器名称
+        """
+        loader, self.fallback_loader = self.fallback_loader, None
+        added = []
+        with self._lock:
+            for name, detector in loader().items():
+                if name not in self.detectors:
+                    self.detectors[name] = detector
+                    self.stats[name] = DetectorStats()
+                    added.append(name)
+        return added
+
+    def _race(self, gray, names):
+        """在线程池中竞速运行指定的检测器
+
+        Args:
+            gray: 灰度图像
+            names: 检测器名称列表，按提交顺序排列
+
+        Returns:
+            str: 最先得到的有效结果，全部失败或超时则返回None
+        """
+        pending = set()
+        for name in names:
+            future = self._executor.submit(self._run, name, gray)
+            self._in_flight[name] = future
+            pending.add(future)
+        deadline = time.perf_counter() + self.timeout
+
+        try:
+            while pending:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, result = future.result()
+                    if result:
+                        with self._lock:
+                            self.stats[name].wins += 1
+                        return result
+            return None
+        finally:
+            # 取消尚未开始的检测器，已在运行的检测器结果将被忽略
+            for future in pending:
+                future.cancel()
+
+    def report(self):
+        """生成各检测器统计信息的文本报告
+
+        Returns:
+            str: 统计报告
+        """
+        lines = []
+        for name in self.ranked_detectors():
+            stats = self.stats[name]
+            lines.append(
+                f"{name}: 运行 {stats.runs} 次, 成功 {stats.successes} 次, "
+                f"获胜 {stats.wins} 次 (胜率 {stats.win_rate:.0%}), "
+                f"平均耗时 {stats.avg_latency * 1000:.1f} ms"
+            )
+        return "\n".join(lines)
+
+    def shutdown(self):
+        """关闭线程池"""
+        self._executor.shutdown(wait=False)
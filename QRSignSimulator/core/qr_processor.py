@@ -10,28 +10,35 @@ import io
 from pyzbar.pyzbar import decode
 from PIL import Image
 import numpy as np
-import cv2
 from datetime import datetime, timedelta
 from dateutil import parser
 
-from QRSignSimulator.config.settings import (
-    QR_VERSION, QR_ERROR_CORRECTION, QR_BOX_SIZE, 
-    QR_BORDER, QR_FILL_COLOR, QR_BACK_COLOR
-)
+from QRSignSimulator.config.settings import DEFAULT_SETTINGS
+from QRSignSimulator.core.decoder_race import DecoderRace, available_detectors, opencv_detectors
+from QRSignSimulator.utils import image_ops
 
 
 class QRCodeProcessor:
     """二维码处理类"""
     
-    @staticmethod
-    def generate_qr_code(data):
-        """生成二维码图像
+    def __init__(self, settings=None):
+        """初始化
+        
+        Args:
+            settings: 设置对象 (Settings)，默认使用 DEFAULT_SETTINGS
+        """
+        self.settings = settings or DEFAULT_SETTINGS
+        # 竞速解码器，在该处理器的所有调用间共享以累计各检测器的统计信息
+        self._decoder_race = None
+    
+    def _build_qr(self, data):
+        """按当前设置构造并排版二维码
         
         Args:
             data: 二维码数据
             
         Returns:
-            PIL.Image: 生成的二维码图像
+            qrcode.QRCode: 已完成排版的二维码对象
         """
         # 设置二维码参数
         error_correction_map = {
@@ -41,30 +48,93 @@ class QRCodeProcessor:
             'H': qrcode.constants.ERROR_CORRECT_H
         }
         
+        settings = self.settings
         error_correction = error_correction_map.get(
-            QR_ERROR_CORRECTION, 
+            settings.qr_error_correction, 
             qrcode.constants.ERROR_CORRECT_L
         )
         
         qr = qrcode.QRCode(
-            version=QR_VERSION,
+            version=settings.qr_version,
             error_correction=error_correction,
-            box_size=QR_BOX_SIZE,
-            border=QR_BORDER,
+            box_size=settings.qr_box_size,
+            border=settings.qr_border,
         )
         qr.add_data(data)
         qr.make(fit=True)
+        return qr
+    
+    def generate_qr_code(self, data):
+        """生成二维码图像
+        
+        Args:
+            data: 二维码数据
+            
+        Returns:
+            PIL.Image: 生成的二维码图像
+        """
+        qr = self._build_qr(data)
         
         # 创建图像
-        img = qr.make_image(fill_color=QR_FILL_COLOR, back_color=QR_BACK_COLOR)
+        img = qr.make_image(fill_color=self.settings.qr_fill_color, back_color=self.settings.qr_back_color)
         return img
     
-    @staticmethod
-    def decode_qr_from_image(image):
+    def generate_qr_matrix(self, data):
+        """生成二维码模块矩阵（含静区），不进行光栅化
+        
+        Args:
+            data: 二维码数据
+            
+        Returns:
+            numpy.ndarray: 布尔矩阵，True表示深色模块
+        """
+        qr = self._build_qr(data)
+        return np.array(qr.get_matrix(), dtype=bool)
+    
+    def get_decoder_race(self):
+        """获取共享的竞速解码器
+        
+        Returns:
+            DecoderRace: 竞速解码器
+        """
+        if self._decoder_race is None:
+            if self.settings.lean_mode:
+                # 精简模式：平时只用pyzbar，全部失败时才加载OpenCV检测器作为后备
+                self._decoder_race = DecoderRace(
+                    detectors=available_detectors(include_opencv=False),
+                    fallback_loader=opencv_detectors,
+                    max_workers=self.settings.decode_race_workers,
+                    timeout=self.settings.decode_race_timeout
+                )
+            else:
+                self._decoder_race = DecoderRace(
+                    max_workers=self.settings.decode_race_workers,
+                    timeout=self.settings.decode_race_timeout
+                )
+        return self._decoder_race
+    
+    def decoder_report(self):
+        """竞速解码器各检测器的统计报告
+        
+        Returns:
+            str: 统计报告，尚未使用竞速解码时返回空字符串
+        """
+        if self._decoder_race is None:
+            return ""
+        return self._decoder_race.report()
+    
+    def close(self):
+        """释放竞速解码器的线程池"""
+        if self._decoder_race is not None:
+            self._decoder_race.shutdown()
+            self._decoder_race = None
+    
+    def decode_qr_from_image(self, image, race=None):
         """从图像中解码二维码
         
         Args:
             image: 图像数据 (PIL.Image, numpy.ndarray, 或文件路径)
+            race: 是否使用多检测器竞速解码，默认由 decode_race 设置决定
             
         Returns:
             str: 解码后的二维码数据，如果解码失败则返回None
@@ -80,25 +150,14 @@ class QRCodeProcessor:
                 abs_path = os.path.abspath(image)
                 
                 # 尝试多种方式读取图像
-                img = None
-                
-                # 方法1: 使用cv2.imread直接读取
-                img = cv2.imread(abs_path)
-                
-                # 方法2: 如果cv2.imread失败，尝试使用PIL读取后转换
-                if img is None:
-                    try:
-                        pil_img = Image.open(abs_path)
-                        img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
-                    except Exception:
-                        pass
+                # 方法1: 直接按路径读取
+                img = image_ops.imread(abs_path)
                 
-                # 方法3: 如果前两种方法都失败，尝试使用文件流读取
+                # 方法2: 如果按路径读取失败，尝试使用文件流读取
                 if img is None:
                     try:
                         with open(abs_path, 'rb') as f:
-                            img_data = np.frombuffer(f.read(), np.uint8)
-                            img = cv2.imdecode(img_data, cv2.IMREAD_COLOR)
+                            img = image_ops.imdecode(f.read())
                     except Exception:
                         pass
                 
@@ -107,7 +166,7 @@ class QRCodeProcessor:
                 
             elif isinstance(image, Image.Image):
                 # PIL图像
-                img = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+                img = image_ops.pil_to_bgr(image)
             
             elif isinstance(image, np.ndarray):
                 # NumPy数组
@@ -116,6 +175,14 @@ class QRCodeProcessor:
             else:
                 return None
             
+            if race is None:
+                race = self.settings.decode_race
+            
+            if race:
+                # 所有检测器共享同一个灰度缓冲区
+                gray = image_ops.to_gray(img)
+                return self.get_decoder_race().decode(gray)
+            
             # 解码二维码
             decoded_objects = decode(img)
             for obj in decoded_objects:
@@ -0,0 +1,298 @@
+"""
+编码→解码往返校验工具
+验证生成的每个签到码光栅化后都能被 decode_qr_from_image 正确解码
+
+用法:
+    python -m QRSignSimulator.tools.roundtrip_verify --count 1000000
+    python -m QRSignSimulator.tools.roundtrip_verify --corpus payloads.txt --workers 8
+    python -m QRSignSimulator.tools.roundtrip_verify --raster matrix
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+
+from PIL import Image, ImageColor
+
+from QRSignSimulator.config.settings import (
+    QR_TEMPLATE, ID_LENGTH, CLASS_LESSON_ID_LENGTH, Settings
+)
+from QRSignSimulator.core.qr_processor import QRCodeProcessor
+from QRSignSimulator.utils.module_renderer import fit_module_scale, module_pixels
+
+# 每个任务块包含的签到码数量
+DEFAULT_CHUNK_SIZE = 500
+# 报告中最多列出的失败签到码数量
+MAX_REPORTED_FAILURES = 20
+# 可选的解码方式：pyzbar 为单线程的pyzbar解码，race 为多检测器竞速解码
+DECODERS = ("pyzbar", "race")
+# 可选的光栅化方式：image 为 generate_qr_code 绘制的图像，matrix 为主窗口显示的模块矩阵整数倍放大图像
+RASTERS = ("image", "matrix")
+
+
+def generate_payloads(seed, count):
+    """按种子确定性地生成一批签到码数据
+
+    Args:
+        seed: 随机种子
+        count: 生成数量
+
+    Returns:
+        list: 签到码数据字符串列表
+    """
+    rng = random.Random(seed)
+    base_time = datetime(2025, 1, 1)
+    payloads = []
+    for _ in range(count):
+        create_time = base_time + timedelta(milliseconds=rng.randrange(365 * 24 * 3600 * 1000))
+        # 交替使用带毫秒和不带毫秒的两种时间格式
+        if rng.random() < 0.5:
+            time_str = create_time.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+        else:
+            time_str = create_time.strftime('%Y-%m-%dT%H:%M:%S')
+        payloads.append(QR_TEMPLATE.format(
+            id=''.join(rng.choices(string.digits, k=ID_LENGTH)),
+            site_id=''.join(rng.choices(string.digits, k=ID_LENGTH)),
+            create_time=time_str,
+            class_lesson_id=''.join(rng.choices(string.digits, k=CLASS_LESSON_ID_LENGTH))
+        ))
+    return payloads
+
+
+# 工作进程内复用的二维码处理器
+_processor = None
+
+
+def _get_processor():
+    """获取当前进程的二维码处理器"""
+    global _processor
+    if _processor is None:
+        _processor = QRCodeProcessor(Settings.load())
+    return _processor
+
+
+def rasterize(processor, payload, raster="image"):
+    """将签到码光栅化为RGB图像
+
+    Args:
+        processor: 二维码处理器
+        payload: 签到码数据
+        raster: 光栅化方式，见 RASTERS
+
+    Returns:
+        PIL.Image: RGB图像
+    """
+    if raster == "matrix":
+        # 与主窗口布局完成前的绘制方式一致：模块矩阵按整数倍放大，颜色由PIL解析
+        settings = processor.settings
+        matrix = processor.generate_qr_matrix(payload)
+        scale = fit_module_scale(matrix.shape[0], settings.image_max_width, settings.image_max_height,
+                                 settings.qr_box_size)
+        pixels = module_pixels(matrix, scale,
+                               ImageColor.getrgb(settings.qr_fill_color)[:3],
+                               ImageColor.getrgb(settings.qr_back_color)[:3])
+        return Image.fromarray(pixels, 'RGB')
+    return processor.generate_qr_code(payload).get_image().convert('RGB')
+
+
+def verify_payloads(payloads, decoder="pyzbar", raster="image"):
+    """对一批签到码执行 编码→光栅化→解码 校验
+
+    解码方式固定，不受 decode_race 设置影响：竞速解码在每个工作进程内还会启动线程池，
+    破坏每核一个进程的线性扩展，且OpenCV解码成功会掩盖pyzbar的解码失败。
+
+    Args:
+        payloads: 签到码数据字符串列表
+        decoder: 解码方式，见 DECODERS
+        raster: 光栅化方式，见 RASTERS
+
+    Returns:
+        tuple: (校验数量, 失败列表[(原始数据, 解码结果)])
+    """
+    processor = _get_processor()
+    failures = []
+    for payload in payloads:
+        # 光栅化为RGB图像，与界面显示和剪贴板读取时的输入一致
+        image = rasterize(processor, payload, raster)
+        decoded = processor.decode_qr_from_image(image, race=(decoder == "race"))
+        if decoded != payload:
+            failures.append((payload, decoded))
+    return len(payloads), failures
+
+
+def _verify_task(task, decoder, raster):
+    """进程池任务入口
+
+    Args:
+        task: ("seed", 种子, 数量) 或 ("list", 签到码列表)
+        decoder: 解码方式
+        raster: 光栅化方式
+
+    Returns:
+        tuple: 同 verify_payloads
+    """
+    if task[0] == "seed":
+        _, seed, count = task
+        return verify_payloads(generate_payloads(seed, count), decoder, raster)
+    return verify_payloads(task[1], decoder, raster)
+
+
+def iter_tasks(count=None, seed=0, corpus_path=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """按块切分工作，避免在主进程中一次性构造完整语料
+
+    合成语料只向子进程传递 (种子, 数量)，由子进程自行生成签到码；
+    文件语料按行读取并分块发送。
+
+    Yields:
+        tuple: 进程池任务
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size 必须为正数: {chunk_size}")
+    if corpus_path:
+        chunk = []
+        with open(corpus_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\r\n')
+                if not line:
+                    continue
+                chunk.append(line)
+                if len(chunk) >= chunk_size:
+                    yield ("list", chunk)
+                    chunk = []
+        if chunk:
+            yield ("list", chunk)
+        return
+
+    remaining = count
+    chunk_index = 0
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield ("seed", seed * 1000003 + chunk_index, size)
+        remaining -= size
+        chunk_index += 1
+
+
+def run_verification(count=None, seed=0, corpus_path=None, workers=None,
+                     chunk_size=DEFAULT_CHUNK_SIZE, decoder="pyzbar", raster="image",
+                     progress=None):
+    """并行执行往返校验
+
+    Args:
+        count: 合成语料数量（未指定 corpus_path 时使用）
+        seed: 合成语料的随机种子
+        corpus_path: 语料文件路径，每行一个签到码
+        workers: 工作进程数，默认为CPU核心数
+        chunk_size: 每个任务块的签到码数量
+        decoder: 解码方式，见 DECODERS
+        raster: 光栅化方式，见 RASTERS
+        progress: 进度回调 progress(已校验数量, 失败数量)，可选
+
+    Returns:
+        dict: 校验结果 (total, failed, failures, elapsed, throughput, workers, decoder, raster)
+    """
+    if decoder not in DECODERS:
+        raise ValueError(f"未知的解码方式: {decoder}")
+    if raster not in RASTERS:
+        raise ValueError(f"未知的光栅化方式: {raster}")
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size 必须为正数: {chunk_size}")
+    if workers is not None and workers <= 0:
+        raise ValueError(f"workers 必须为正数: {workers}")
+    workers = workers or os.cpu_count() or 1
+    tasks = iter_tasks(count, seed, corpus_path, chunk_size)
+
+    total = 0
+    failed = 0
+    failures = []
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # 限制同时在途的任务块数量，保持每个核心都有活干又不堆积内存
+        pending = set()
+        max_pending = workers * 4
+        for task in tasks:
+            pending.add(executor.submit(_verify_task, task, decoder, raster))
+            if len(pending) >= max_pending:
+                total, failed = _collect(pending, failures, total, failed, progress)
+        while pending:
+            total, failed = _collect(pending, failures, total, failed, progress)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "total": total,
+        "failed": failed,
+        "failures": failures,
+        "elapsed": elapsed,
+        "throughput": total / elapsed if elapsed > 0 else 0.0,
+        "workers": workers,
+        "decoder": decoder,
+        "raster": raster,
+    }
+
+
+def _collect(pending, failures, total, failed, progress):
+    """等待至少一个任务块完成并累计结果"""
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.discard(future)
+        checked, chunk_failures = future.result()
+        total += checked
+        failed += len(chunk_failures)
+        if len(failures) < MAX_REPORTED_FAILURES:
+            failures.extend(chunk_failures[:MAX_REPORTED_FAILURES - len(failures)])
+        if progress:
+            progress(total, failed)
+    return total, failed
+
+
+def main(argv=None):
+    """命令行入口"""
+    arg_parser = argparse.ArgumentParser(description="二维码 编码→解码 往返校验")
+    arg_parser.add_argument("--count", type=int, default=10000, help="合成语料数量")
+    arg_parser.add_argument("--seed", type=int, default=0, help="合成语料随机种子")
+    arg_parser.add_argument("--corpus", help="语料文件，每行一个签到码（指定后忽略 --count）")
+    arg_parser.add_argument("--workers", type=int, default=None, help="工作进程数，默认为CPU核心数")
+    arg_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="每个任务块的签到码数量")
+    arg_parser.add_argument("--decoder", choices=DECODERS, default="pyzbar",
+                            help="解码方式：pyzbar（默认，单线程）或 race（多检测器竞速）")
+    arg_parser.add_argument("--raster", choices=RASTERS, default="image",
+                            help="光栅化方式：image（默认，qrcode库绘制）或 matrix（主窗口的模块矩阵绘制）")
+    args = arg_parser.parse_args(argv)
+
+    def progress(total, failed):
+        print(f"\r已校验 {total}，失败 {failed}", end="", flush=True)
+
+    try:
+        result = run_verification(
+            count=args.count, seed=args.seed, corpus_path=args.corpus,
+            workers=args.workers, chunk_size=args.chunk_size, decoder=args.decoder,
+            raster=args.raster, progress=progress
+        )
+    except ValueError as e:
+        print(f"参数错误: {str(e)}")
+        return 2
+    print()
+    print(f"工作进程: {result['workers']}")
+    print(f"解码方式: {result['decoder']}")
+    print(f"光栅化方式: {result['raster']}")
+    print(f"校验总数: {result['total']}")
+    print(f"失败数量: {result['failed']}")
+    print(f"耗时: {result['elapsed']:.2f} 秒")
+    print(f"吞吐量: {result['throughput']:.1f} 个/秒")
+
+    if result["failures"]:
+        print(f"失败样例（最多 {MAX_REPORTED_FAILURES} 个）:")
+        for payload, decoded in result["failures"]:
+            print(f"  原始: {payload}")
+            print(f"  解码: {decoded}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
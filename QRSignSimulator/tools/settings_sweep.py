@@ -0,0 +1,271 @@
+"""
+设置参数扫描基准工具
+对设置项的多种组合逐一测量每帧生成和绘制耗时，记录各组合对性能的影响
+
+用法:
+    python -m QRSignSimulator.tools.settings_sweep \
+        --set qr_error_correction=L,H --set repaint_full_threshold=0.35,1 --display-size 760x400 --csv sweep.csv
+"""
+
+import argparse
+import csv
+import itertools
+import sys
+import time
+from datetime import datetime, timedelta
+
+from QRSignSimulator.config.settings import Settings
+from QRSignSimulator.core.qr_processor import QRCodeProcessor
+from QRSignSimulator.core.sign_generator import SignGenerator
+from QRSignSimulator.utils.time_utils import TimeManager
+from QRSignSimulator.utils.profiler import ProfileCapture
+from QRSignSimulator.utils.module_renderer import ModuleRenderer, find_dirty_rects, fit_module_scale
+
+# 未指定 --set 时使用的默认扫描范围
+# qr_box_size 和 image_max_* 只在窗口布局完成前起作用，指定 --display-size 时不影响结果
+DEFAULT_SWEEP = {
+    "qr_error_correction": ["L", "M", "H"],
+    "repaint_full_threshold": ["0.35", "1"],
+}
+
+RESULT_COLUMNS = [
+    "encode_ms", "render_ms", "frame_ms", "tick_ms", "est_cpu_percent",
+    "dirty_fraction", "repainted_fraction", "full_repaints",
+]
+
+
+def parse_sweep(specs):
+    """解析 --set 参数
+
+    Args:
+        specs: ["名称=值1,值2", ...]
+
+    Returns:
+        dict: 设置项名称 -> 候选值列表
+    """
+    sweep = {}
+    for spec in specs:
+        if "=" not in spec:
+            raise ValueError(f"无效的扫描参数: {spec}")
+        name, values = spec.split("=", 1)
+        name = name.strip().lower()
+        if name not in Settings.field_names():
+            raise ValueError(f"未知的设置项: {name}")
+        sweep[name] = [v.strip() for v in values.split(",") if v.strip()]
+    return sweep
+
+
+def iter_combinations(base_settings, sweep):
+    """遍历所有设置组合
+
+    Yields:
+        tuple: (组合字典, Settings)
+    """
+    names = list(sweep)
+    for values in itertools.product(*(sweep[name] for name in names)):
+        combo = dict(zip(names, values))
+        yield combo, base_settings.with_overrides(**combo)
+
+
+class _NullPhoto:
+    """代替 tk.PhotoImage 的空图像，使渲染器可以在没有显示器的环境下运行
+
+    渲染器的差分计算和整幅重绘数据的构造都照常执行，只是不把数据交给Tk，
+    因此测得的绘制耗时不含Tk解析像素数据的开销。
+    """
+
+    def __init__(self, master=None, width=0, height=0):
+        self.width = width
+        self.height = height
+
+    def put(self, data, to=None):
+        pass
+
+
+def parse_display_size(spec):
+    """解析 --display-size 参数
+
+    Args:
+        spec: "宽x高"，如 "760x400"
+
+    Returns:
+        tuple: (宽, 高)
+    """
+    try:
+        width, height = (int(v) for v in spec.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"无效的显示尺寸: {spec}")
+    if width <= 0 or height <= 0:
+        raise ValueError(f"无效的显示尺寸: {spec}")
+    return width, height
+
+
+def benchmark_settings(settings, sign_data, frames=50, display_size=None):
+    """测量一组设置下的生成耗时
+
+    模拟实时生成循环：每帧更新createTime、生成模块矩阵并交给 ModuleRenderer 绘制，
+    与主窗口使用的路径相同。指定 display_size 时按主窗口布局完成后的规则取能放入该区域的
+    最大整数模块边长；否则按布局完成前的规则，受 qr_box_size 和 image_max_* 限制。另外测量不重新编码时每次循环唤醒的耗时，结合 update_interval
+    和 refresh_rate 估算稳态CPU占用。同时统计相邻两帧的变化面积占比，以及考虑
+    repaint_full_threshold / repaint_max_rects 整幅重绘回退后实际重绘的面积占比。
+
+    Args:
+        settings: 设置对象
+        sign_data: SignGenerator.generate_sign_data() 的返回值 (模板, 基准时间, 时间格式)
+        frames: 测量帧数
+        display_size: 二维码显示区域的 (宽, 高)，可选
+
+    Returns:
+        dict: 各阶段平均耗时（毫秒）、估算的CPU占用百分比及重绘面积占比
+    """
+    qr_processor = QRCodeProcessor(settings)
+    time_manager = TimeManager(settings)
+    renderer = ModuleRenderer(
+        None,
+        fill_color=settings.qr_fill_color,
+        back_color=settings.qr_back_color,
+        full_repaint_threshold=settings.repaint_full_threshold,
+        max_dirty_rects=settings.repaint_max_rects,
+        cache_size=settings.render_cache_size,
+        photo_factory=_NullPhoto
+    )
+
+    template, base_time, time_format = sign_data
+
+    encode_total = 0.0
+    render_total = 0.0
+    dirty_total = 0.0
+    for i in range(frames):
+        target_time = base_time + timedelta(seconds=settings.update_interval * i)
+
+        start = time.perf_counter()
+        data = qr_processor.update_create_time(template, target_time, time_format)
+        matrix = qr_processor.generate_qr_matrix(data)
+        encoded = time.perf_counter()
+
+        # 与 MainWindow.module_scale 的规则一致
+        if display_size is not None:
+            scale = fit_module_scale(matrix.shape[0], *display_size)
+        else:
+            scale = fit_module_scale(matrix.shape[0], settings.image_max_width, settings.image_max_height,
+                                     settings.qr_box_size)
+
+        # 变化面积在计时之外单独统计
+        previous = renderer.matrix
+        if previous is not None and previous.shape == matrix.shape:
+            rects = find_dirty_rects(previous, matrix)
+            dirty_total += sum((r1 - r0) * (c1 - c0) for r0, c0, r1, c1, _ in rects) / matrix.size
+        else:
+            dirty_total += 1.0
+
+        render_start = time.perf_counter()
+        renderer.render(matrix, scale)
+        rendered = time.perf_counter()
+
+        encode_total += encoded - start
+        render_total += rendered - render_start
+
+    tick_start = time.perf_counter()
+    for _ in range(frames):
+        now = time_manager.get_beijing_time()
+        time_manager.calculate_target_time(base_time, now)
+    tick_total = time.perf_counter() - tick_start
+
+    encode_ms = encode_total / frames * 1000
+    render_ms = render_total / frames * 1000
+    frame_ms = encode_ms + render_ms
+    tick_ms = tick_total / frames * 1000
+    est_cpu = (frame_ms / settings.update_interval + tick_ms / settings.refresh_rate) / 1000 * 100
+    stats = renderer.stats()
+
+    return {
+        "encode_ms": encode_ms,
+        "render_ms": render_ms,
+        "frame_ms": frame_ms,
+        "tick_ms": tick_ms,
+        "est_cpu_percent": est_cpu,
+        "dirty_fraction": dirty_total / frames,
+        "repainted_fraction": stats["avg_repainted"],
+        "full_repaints": stats["full_repaints"],
+    }
+
+
+def run_sweep(base_settings, sweep, frames=50, display_size=None):
+    """执行参数扫描
+
+    Args:
+        base_settings: 基础设置对象
+        sweep: 设置项名称 -> 候选值列表
+        frames: 每个组合的测量帧数
+        display_size: 二维码显示区域的 (宽, 高)，可选
+
+    Returns:
+        list: [(组合字典, 结果字典), ...]
+    """
+    # 所有组合使用同一个签到码模板和基准时间，各组合编码的内容完全相同，结果才可比较
+    sign_data = SignGenerator.generate_sign_data()
+    results = []
+    for combo, settings in iter_combinations(base_settings, sweep):
+        results.append((combo, benchmark_settings(settings, sign_data, frames, display_size)))
+    return results
+
+
+def main(argv=None):
+    """命令行入口"""
+    arg_parser = argparse.ArgumentParser(description="设置参数扫描基准")
+    arg_parser.add_argument("--config", help="基础设置的JSON配置文件")
+    arg_parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                            help="要扫描的设置项及候选值，可多次指定")
+    arg_parser.add_argument("--frames", type=int, default=50, help="每个组合的测量帧数")
+    arg_parser.add_argument("--display-size", metavar="WxH",
+                            help="按主窗口布局完成后的规则，以该显示区域尺寸确定模块边长")
+    arg_parser.add_argument("--csv", help="将结果写入CSV文件")
+    arg_parser.add_argument("--profile", type=float, metavar="SECONDS",
+                            help="对扫描过程的前若干秒进行性能采样分析")
+    args = arg_parser.parse_args(argv)
+
+    try:
+        sweep = parse_sweep(args.set) if args.set else DEFAULT_SWEEP
+        base_settings = Settings.load(args.config)
+        display_size = parse_display_size(args.display_size) if args.display_size else None
+        # 预先构造所有组合，尽早发现无效的设置值
+        list(iter_combinations(base_settings, sweep))
+    except ValueError as e:
+        print(f"参数错误: {str(e)}")
+        return 2
+
+    profiler = None
+    if args.profile:
+        profiler = ProfileCapture(output_dir=base_settings.profile_output_dir)
+        profiler.start(args.profile)
+
+    results = run_sweep(base_settings, sweep, args.frames, display_size)
+
+    names = list(sweep)
+    header = names + RESULT_COLUMNS
+    print("  ".join(f"{h:>18}" for h in header))
+    for combo, result in results:
+        row = [combo[name] for name in names] + [f"{result[c]:.3f}" for c in RESULT_COLUMNS]
+        print("  ".join(f"{v:>18}" for v in row))
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp"] + header)
+            timestamp = datetime.now().isoformat(timespec="seconds")
+            for combo, result in results:
+                writer.writerow([timestamp] + [combo[name] for name in names]
+                                + [round(result[c], 4) for c in RESULT_COLUMNS])
+        print(f"结果已写入 {args.csv}")
+
+    if profiler:
+        profiler.stop()
+        profile_result = profiler.wait()
+        print(f"性能分析: {profile_result['samples']} 个样本, 已保存到 {profile_result['pstats_path']}")
+        for line in profile_result["top"]:
+            print(f"  {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
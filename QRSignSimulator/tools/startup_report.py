@@ -0,0 +1,115 @@
+"""
+启动开销对比工具
+分别在精简模式和完整模式下启动新进程，报告导入耗时、启动后内存占用以及首次识别二维码后的内存占用
+
+用法:
+    python -m QRSignSimulator.tools.startup_report
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def _peak_rss_mb():
+    """获取当前进程的峰值常驻内存（MB），不支持的平台返回None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux以KB为单位，macOS以字节为单位
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def measure_current_process():
+    """在当前进程中测量启动开销（由子进程调用）
+
+    Returns:
+        dict: 测量结果
+    """
+    baseline_rss = _peak_rss_mb()
+    start = time.perf_counter()
+
+    from QRSignSimulator.config.settings import Settings
+    from QRSignSimulator.ui import main_window  # noqa: F401  导入与启动主窗口时相同的模块
+    from QRSignSimulator.core.qr_processor import QRCodeProcessor
+
+    imported = time.perf_counter()
+
+    settings = Settings.load()
+    processor = QRCodeProcessor(settings)
+    # 与 MainWindow 初始化时的行为一致
+    if settings.decode_race and not settings.lean_mode:
+        processor.get_decoder_race()
+
+    started = time.perf_counter()
+    startup_rss = _peak_rss_mb()
+    cv2_at_startup = "cv2" in sys.modules
+
+    payload = "checkwork|id=1&siteId=2&createTime=2025-03-13T16:34:01.221&classLessonId=3"
+    raster = processor.generate_qr_code(payload).get_image().convert("RGB")
+    decoded = processor.decode_qr_from_image(raster)
+    processor.close()
+
+    return {
+        "lean_mode": settings.lean_mode,
+        "import_ms": (imported - start) * 1000,
+        "startup_ms": (started - start) * 1000,
+        "baseline_rss_mb": baseline_rss,
+        "startup_rss_mb": startup_rss,
+        "decode_rss_mb": _peak_rss_mb(),
+        "cv2_at_startup": cv2_at_startup,
+        "cv2_after_decode": "cv2" in sys.modules,
+        "decode_ok": decoded == payload,
+    }
+
+
+def measure_mode(lean_mode):
+    """在新进程中测量指定模式的启动开销
+
+    Args:
+        lean_mode: 是否为精简模式
+
+    Returns:
+        dict: 测量结果
+    """
+    env = dict(os.environ, QRSIGN_LEAN_MODE="1" if lean_mode else "0")
+    output = subprocess.run(
+        [sys.executable, "-m", "QRSignSimulator.tools.startup_report", "--child"],
+        env=env, check=True, stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout
+    # 只取最后一行，忽略模块导入过程中可能的其他输出
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _format_mb(value):
+    return "不可用" if value is None else f"{value:.1f} MB"
+
+
+def main(argv=None):
+    """命令行入口"""
+    argv = sys.argv[1:] if argv is None else argv
+    if "--child" in argv:
+        print(json.dumps(measure_current_process()))
+        return 0
+
+    for lean_mode in (False, True):
+        result = measure_mode(lean_mode)
+        print("精简模式" if lean_mode else "完整模式")
+        print(f"  导入耗时: {result['import_ms']:.0f} ms")
+        print(f"  启动耗时: {result['startup_ms']:.0f} ms")
+        print(f"  启动后内存峰值: {_format_mb(result['startup_rss_mb'])}")
+        print(f"  首次识别后内存峰值: {_format_mb(result['decode_rss_mb'])}")
+        print(f"  启动时已加载OpenCV: {'是' if result['cv2_at_startup'] else '否'}")
+        print(f"  识别后已加载OpenCV: {'是' if result['cv2_after_decode'] else '否'}")
+        print(f"  识别结果正确: {'是' if result['decode_ok'] else '否'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
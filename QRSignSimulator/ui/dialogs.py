@@ -112,4 +112,48 @@ class InputDialogs:
         if result["cancelled"]:
             return None
         
-        return result 
\ No newline at end of file
+        return result 
+
+class InfoDialogs:
+    """信息展示对话框类"""
+    
+    @staticmethod
+    def show_profile_result(parent, result, decoder_report=""):
+        """显示性能分析结果
+        
+        非模态窗口，不阻塞实时生成，保留到用户关闭为止；
+        文本可以选中复制，方便取得结果文件的路径
+        
+        Args:
+            parent: 父窗口
+            result: ProfileCapture 返回的结果字典
+            decoder_report: 竞速解码器的检测器统计，可选
+            
+        Returns:
+            tk.Toplevel: 对话框窗口
+        """
+        dialog = tk.Toplevel(parent)
+        dialog.title("性能分析结果")
+        dialog.transient(parent)
+        
+        lines = [
+            f"采样 {result['elapsed']:.1f} 秒，共 {result['samples']} 个样本",
+            f"pstats: {result['pstats_path']}",
+            f"折叠栈: {result['collapsed_path']}",
+            "",
+            "自身耗时最多的函数:",
+        ]
+        lines.extend(f"  {line}" for line in result["top"] or ["（无样本）"])
+        if decoder_report:
+            lines.extend(["", "解码器统计:"])
+            lines.extend(f"  {line}" for line in decoder_report.splitlines())
+        
+        text = tk.Text(dialog, width=80, height=len(lines) + 1, wrap=tk.NONE)
+        text.insert("1.0", "\n".join(lines))
+        text.config(state=tk.DISABLED)
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        close_button = tk.Button(dialog, text="关闭", command=dialog.destroy, width=10)
+        close_button.pack(pady=(0, 10))
+        
+        return dialog
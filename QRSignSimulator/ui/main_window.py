@@ -7,30 +7,34 @@
 import tkinter as tk
 from tkinter import Label, Button, Frame
 import threading
-import numpy as np
 import time
-import io
-import cv2
 
-from QRSignSimulator.config.settings import APP_TITLE, APP_WIDTH, APP_HEIGHT, REFRESH_RATE
+from QRSignSimulator.config.settings import (
+    APP_TITLE, APP_WIDTH, APP_HEIGHT, PROFILE_HOTKEY, DEFAULT_SETTINGS
+)
 from QRSignSimulator.core.qr_processor import QRCodeProcessor
 from QRSignSimulator.core.sign_generator import SignGenerator
 from QRSignSimulator.core.clipboard import ClipboardManager
 from QRSignSimulator.utils.image_utils import ImageProcessor
 from QRSignSimulator.utils.time_utils import TimeManager
-from QRSignSimulator.ui.dialogs import InputDialogs
+from QRSignSimulator.utils.profiler import ProfileCapture
+from QRSignSimulator.utils.module_renderer import ModuleRenderer, fit_module_scale
+from QRSignSimulator.utils import image_ops
+from QRSignSimulator.ui.dialogs import InputDialogs, InfoDialogs
 
 
 class MainWindow:
     """主窗口类"""
     
-    def __init__(self, root):
+    def __init__(self, root, settings=None):
         """初始化主窗口
         
         Args:
             root: Tkinter根窗口
+            settings: 设置对象 (Settings)，默认使用 DEFAULT_SETTINGS
         """
         self.root = root
+        self.settings = settings or DEFAULT_SETTINGS
         self.root.title(APP_TITLE)
         self.root.geometry(f"{APP_WIDTH}x{APP_HEIGHT}")
         
@@ -48,14 +52,42 @@ class MainWindow:
         self.custom_class_lesson_id = None
         self.using_template = False  # 标记是否使用模板二维码
         
+        # 窗口可见性：最小化或被完全遮挡时暂停编码和标签更新
+        self.window_hidden = False
+        self.wake_event = threading.Event()  # 可见性变化或停止生成时唤醒生成线程
+        self.hidden_since = None  # 隐藏开始时间 (time.monotonic)
+        self.hidden_cpu_start = None  # 隐藏开始时的进程CPU时间
+        self.hidden_report = ""  # 最近一次隐藏期间的开销报告
+        
+        # 二维码显示区域尺寸，跟随窗口大小变化
+        self.display_size = None  # 可用于绘制的 (宽, 高)，窗口布局完成前为None
+        self.resize_job = None  # 防抖定时任务
+        self.current_matrix = None  # 当前显示的模块矩阵，调整大小时直接重绘而无需重新编码
+        
         # 创建组件
-        self.qr_processor = QRCodeProcessor()
-        self.image_processor = ImageProcessor()
-        self.time_manager = TimeManager()
+        self.qr_processor = QRCodeProcessor(self.settings)
+        self.image_processor = ImageProcessor(self.settings)
+        self.time_manager = TimeManager(self.settings)
         self.sign_generator = SignGenerator()
+        self.profiler = ProfileCapture(output_dir=self.settings.profile_output_dir)
+        self.profile_dialog = None  # 最近一次性能分析结果窗口
+        
+        # 非精简模式下预先创建竞速解码器（会导入OpenCV），避免首次识别时的加载延迟
+        if self.settings.decode_race and not self.settings.lean_mode:
+            self.qr_processor.get_decoder_race()
         
         # 创建UI
         self.setup_ui()
+        
+        # 性能分析快捷键
+        self.root.bind(PROFILE_HOTKEY, lambda event: self.toggle_profiling())
+        
+        # 关闭窗口时停止后台线程
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # 跟踪窗口可见性
+        for sequence in ("<Map>", "<Unmap>", "<Visibility>"):
+            self.root.bind(sequence, self.on_visibility_event, add="+")
     
     def setup_ui(self):
         """设置UI组件"""
@@ -110,6 +142,110 @@ class MainWindow:
         # 二维码显示区域
         self.qr_label = Label(self.root)
         self.qr_label.pack(expand=True, fill=tk.BOTH, padx=20, pady=20)
+        self.qr_label.image = None
+        
+        # 二维码渲染器，持有持久的PhotoImage，相邻两帧只重绘变化的模块
+        self.qr_renderer = ModuleRenderer(
+            self.qr_label,
+            fill_color=self.settings.qr_fill_color,
+            back_color=self.settings.qr_back_color,
+            full_repaint_threshold=self.settings.repaint_full_threshold,
+            max_dirty_rects=self.settings.repaint_max_rects,
+            cache_size=self.settings.render_cache_size
+        )
+        self.qr_label.bind("<Configure>", self.on_qr_label_configure)
+    
+    def toggle_profiling(self, duration=None):
+        """开始或提前结束性能采样分析
+        
+        Args:
+            duration: 采样时长（秒），默认使用 profile_duration 设置
+        """
+        if self.profiler.active:
+            self.profiler.stop()
+            self.status_label.config(text="正在结束性能分析...")
+            return
+        
+        duration = duration or self.settings.profile_duration
+        # 回调在采样线程中执行，需切回UI线程更新界面
+        self.profiler.start(
+            duration,
+            on_finish=lambda result: self.root.after(0, lambda: self.show_profile_result(result))
+        )
+        self.status_label.config(text=f"正在进行性能分析（{duration:g} 秒，再次按 {PROFILE_HOTKEY} 提前结束）")
+    
+    def show_profile_result(self, result):
+        """在单独的窗口中显示性能分析结果
+        
+        状态栏会被下一帧的生成状态覆盖，且多行文本会改变布局、触发二维码区域重绘，
+        因此结果放在非模态窗口中，保留到用户关闭为止
+        
+        Args:
+            result: ProfileCapture 返回的结果字典
+        """
+        lines = [f"性能分析完成: {result['samples']} 个样本, 已保存到 {result['pstats_path']}"]
+        lines.extend(result["top"])
+        print("\n".join(lines))
+        
+        # 只保留最新一次的结果窗口
+        if self.profile_dialog is not None and self.profile_dialog.winfo_exists():
+            self.profile_dialog.destroy()
+        self.profile_dialog = InfoDialogs.show_profile_result(
+            self.root, result, self.qr_processor.decoder_report()
+        )
+        self.status_label.config(text="性能分析完成，结果见弹出窗口")
+    
+    def on_close(self):
+        """关闭主窗口：停止生成线程和性能分析，释放解码线程池"""
+        self.is_running = False
+        self.wake_event.set()
+        self.profiler.stop()
+        self.qr_processor.close()
+        self.root.destroy()
+    
+    def on_visibility_event(self, event):
+        """处理窗口的映射、取消映射和可见性变化事件
+        
+        Args:
+            event: Tk事件
+        """
+        # 根窗口上的绑定也会收到子组件的事件，只关心根窗口本身
+        if event.widget is not self.root:
+            return
+        
+        if event.type == tk.EventType.Unmap:
+            self.set_window_hidden(True)
+        elif event.type == tk.EventType.Map:
+            self.set_window_hidden(False)
+        elif event.type == tk.EventType.Visibility:
+            self.set_window_hidden(event.state == "VisibilityFullyObscured")
+    
+    def set_window_hidden(self, hidden):
+        """更新窗口可见状态，并在恢复可见时报告隐藏期间的开销
+        
+        Args:
+            hidden: 窗口是否隐藏
+        """
+        if hidden == self.window_hidden:
+            return
+        
+        if hidden:
+            self.hidden_since = time.monotonic()
+            self.hidden_cpu_start = time.process_time()
+            self.window_hidden = True
+        else:
+            self.window_hidden = False
+            if self.is_running and self.hidden_since is not None:
+                hidden_seconds = time.monotonic() - self.hidden_since
+                cpu_ms = (time.process_time() - self.hidden_cpu_start) * 1000
+                self.hidden_report = f"窗口隐藏 {hidden_seconds:.0f} 秒期间进程CPU时间 {cpu_ms:.0f} ms"
+                print(self.hidden_report)
+                # 无论目标时间是否变化都立即补绘一帧，由该帧显示隐藏期间的报告
+                self.last_update_time = None
+            self.hidden_since = None
+        
+        # 唤醒生成线程，恢复可见时立即补绘当前帧
+        self.wake_event.set()
     
     def set_course_name(self):
         """设置课程名称"""
@@ -205,19 +341,17 @@ class MainWindow:
                 self.qr_label.config(image=img_tk)
                 self.qr_label.image = img_tk
             
-            # 使用临时文件保存剪贴板图片
-            with io.BytesIO() as output:
-                clipboard_img.save(output, format="PNG")
-                img_data = output.getvalue()
-            
-            # 尝试解码
-            img_cv2 = cv2.imdecode(np.frombuffer(img_data, np.uint8), cv2.IMREAD_COLOR)
-            if img_cv2 is None:
+            # 转换为BGR数组后尝试解码
+            img_bgr = image_ops.pil_to_bgr(clipboard_img)
+            if img_bgr is None or img_bgr.size == 0:
                 self.status_label.config(text="无法处理剪贴板图片")
                 self.clipboard_btn.config(state=tk.NORMAL)
                 return
             
-            qr_data = self.qr_processor.decode_qr_from_image(img_cv2)
+            qr_data = self.qr_processor.decode_qr_from_image(img_bgr)
+            decoder_report = self.qr_processor.decoder_report()
+            if decoder_report:
+                print(f"解码器统计:\n{decoder_report}")
             if not qr_data:
                 self.status_label.config(text="未在剪贴板图片中检测到二维码")
                 self.clipboard_btn.config(state=tk.NORMAL)
@@ -274,6 +408,7 @@ class MainWindow:
             return
         
         self.is_running = True
+        self.hidden_report = ""
         self.start_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
         self.course_btn.config(state=tk.DISABLED)
@@ -288,6 +423,7 @@ class MainWindow:
     def stop_generation(self):
         """停止实时生成"""
         self.is_running = False
+        self.wake_event.set()
         self.start_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
         self.course_btn.config(state=tk.NORMAL)
@@ -305,6 +441,13 @@ class MainWindow:
         """实时生成二维码线程"""
         while self.is_running:
             try:
+                # 先清除唤醒标记再检查可见性，避免错过两者之间发生的恢复事件
+                self.wake_event.clear()
+                if self.window_hidden:
+                    # 窗口隐藏时不编码也不更新标签，阻塞到窗口恢复或停止生成
+                    self.wake_event.wait()
+                    continue
+                
                 # 获取当前北京时间
                 beijing_now = self.time_manager.get_beijing_time()
                 
@@ -332,8 +475,8 @@ class MainWindow:
                     # 生成二维码并显示
                     self.root.after(0, lambda t=target_time: self.generate_and_display(t))
                 
-                # 等待更短的时间，提高响应精度
-                time.sleep(REFRESH_RATE)
+                # 等待更短的时间，提高响应精度；可见性变化或停止生成时提前唤醒
+                self.wake_event.wait(self.settings.refresh_rate)
                 
             except Exception as e:
                 print(f"实时生成错误: {str(e)}")
@@ -341,6 +484,74 @@ class MainWindow:
                 self.root.after(0, lambda: self.status_label.config(text=f"生成错误: {str(e)}"))
                 break
     
+    def on_qr_label_configure(self, event):
+        """二维码显示区域尺寸变化，防抖后再处理
+        
+        Args:
+            event: Tk事件
+        """
+        if self.resize_job is not None:
+            self.root.after_cancel(self.resize_job)
+        self.resize_job = self.root.after(
+            self.settings.resize_debounce_ms,
+            lambda w=event.width, h=event.height: self.apply_display_size(w, h)
+        )
+    
+    def apply_display_size(self, width, height):
+        """应用新的显示区域尺寸
+        
+        只有模块像素边长发生变化时才重绘当前矩阵，不重新编码
+        
+        Args:
+            width: 显示区域宽度
+            height: 显示区域高度
+        """
+        self.resize_job = None
+        # 边框、焦点高亮和Label内边距之内才是可用于绘制的区域
+        frame = int(self.qr_label.cget("borderwidth")) + int(self.qr_label.cget("highlightthickness"))
+        inset_x = 2 * (frame + int(self.qr_label.cget("padx")))
+        inset_y = 2 * (frame + int(self.qr_label.cget("pady")))
+        size = (max(1, width - inset_x), max(1, height - inset_y))
+        if size == self.display_size:
+            return
+        self.display_size = size
+        
+        # 显示区域正在显示剪贴板图片等其他内容时不替换
+        if self.current_matrix is None or self.qr_label.image is not self.qr_renderer.photo:
+            return
+        if self.module_scale(self.current_matrix.shape[0]) != self.qr_renderer.scale:
+            self.display_matrix(self.current_matrix)
+    
+    def module_scale(self, modules):
+        """计算每个模块的像素边长
+        
+        取能完整放入显示区域的最大整数倍；窗口布局完成前沿用最大显示尺寸和 qr_box_size 的限制
+        
+        Args:
+            modules: 每边的模块数（含静区）
+            
+        Returns:
+            int: 模块像素边长
+        """
+        if self.display_size is not None:
+            return fit_module_scale(modules, *self.display_size)
+        return fit_module_scale(modules, self.settings.image_max_width, self.settings.image_max_height,
+                                self.settings.qr_box_size)
+    
+    def display_matrix(self, matrix):
+        """按当前显示区域尺寸绘制模块矩阵
+        
+        Args:
+            matrix: 布尔模块矩阵
+        """
+        self.current_matrix = matrix
+        img_tk = self.qr_renderer.render(matrix, self.module_scale(matrix.shape[0]))
+        
+        # 在UI上显示（持久图像只需在切换时设置一次）
+        if self.qr_label.image is not img_tk:
+            self.qr_label.config(image=img_tk)
+            self.qr_label.image = img_tk  # 保持引用，防止垃圾回收
+    
     def generate_and_display(self, target_time):
         """生成二维码并在UI上显示
         
@@ -348,24 +559,26 @@ class MainWindow:
             target_time: 目标时间 (datetime对象)
         """
         try:
-            # 更新状态
-            self.status_label.config(text=f"正在生成 {self.time_manager.format_datetime(target_time)} 的二维码")
-            
             # 更新二维码数据中的createTime
             new_data = self.qr_processor.update_create_time(
                 self.qr_template, target_time, self.original_time_format
             )
             
-            # 生成二维码
-            qr_img = self.qr_processor.generate_qr_code(new_data)
-            
-            # 转换为可显示的格式
-            img_array = np.array(qr_img)
-            img_tk = self.image_processor.convert_to_tkimage(img_array*255)  # 二值图像需要乘以255
+            # 生成模块矩阵，按能放入显示区域的最大整数倍绘制
+            matrix = self.qr_processor.generate_qr_matrix(new_data)
+            self.display_matrix(matrix)
             
-            # 在UI上显示
-            self.qr_label.config(image=img_tk)
-            self.qr_label.image = img_tk  # 保持引用，防止垃圾回收
+            # 更新状态
+            stats = self.qr_renderer.stats()
+            status = (
+                f"正在生成 {self.time_manager.format_datetime(target_time)} 的二维码"
+                f"（平均重绘面积 {stats['avg_repainted']:.0%}，平均绘制耗时 {stats['avg_paint_ms']:.1f} ms）"
+            )
+            if self.hidden_report:
+                # 隐藏期间的开销报告只在恢复后补绘的第一帧代替生成状态显示一次，保持单行
+                status = self.hidden_report
+                self.hidden_report = ""
+            self.status_label.config(text=status)
             
         except Exception as e:
             print(f"生成二维码错误: {str(e)}")
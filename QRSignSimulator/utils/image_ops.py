@@ -0,0 +1,151 @@
+"""
+图像基础操作模块
+用NumPy/PIL实现程序用到的少量OpenCV操作（颜色空间转换、读取和解码图像），
+避免仅为这些操作导入OpenCV；需要OpenCV检测器时再通过 get_cv2 按需加载
+"""
+
+import io
+
+import numpy as np
+from PIL import Image
+
+_cv2 = None
+
+
+def get_cv2():
+    """按需导入OpenCV
+
+    Returns:
+        module: cv2模块，未安装时返回None
+    """
+    global _cv2
+    if _cv2 is None:
+        try:
+            import cv2
+        except ImportError:
+            return None
+        _cv2 = cv2
+    return _cv2
+
+
+def rgba_to_rgb(img):
+    """去掉Alpha通道（等价于 cv2.COLOR_RGBA2RGB / COLOR_BGRA2BGR）
+
+    Args:
+        img: numpy.ndarray
+
+    Returns:
+        numpy.ndarray: 三通道图像，非四通道图像原样返回
+    """
+    if img.ndim == 3 and img.shape[2] == 4:
+        return np.ascontiguousarray(img[:, :, :3])
+    return img
+
+
+def swap_rb(img):
+    """交换红蓝通道（等价于 cv2.COLOR_RGB2BGR / COLOR_BGR2RGB）
+
+    四通道图像会同时去掉Alpha通道，单通道图像原样返回
+
+    Args:
+        img: numpy.ndarray
+
+    Returns:
+        numpy.ndarray: 交换通道后的图像
+    """
+    if img.ndim == 3 and img.shape[2] >= 3:
+        return np.ascontiguousarray(img[:, :, 2::-1])
+    return img
+
+
+def to_gray(img, bgr=True):
+    """转换为灰度图（与 cv2.COLOR_BGR2GRAY 使用相同的定点系数）
+
+    Args:
+        img: numpy.ndarray，单通道、三通道或四通道
+        bgr: 输入通道顺序是否为BGR
+
+    Returns:
+        numpy.ndarray: uint8灰度图
+    """
+    if img.ndim == 2:
+        return img
+    if img.shape[2] == 1:
+        return img[:, :, 0]
+
+    # 0.299R + 0.587G + 0.114B，按15位定点数计算并四舍五入
+    channels = img[:, :, :3].astype(np.uint32)
+    weights = (3735, 19235, 9798) if bgr else (9798, 19235, 3735)
+    gray = (channels[:, :, 0] * weights[0] + channels[:, :, 1] * weights[1]
+            + channels[:, :, 2] * weights[2] + (1 << 14)) >> 15
+    return gray.astype(np.uint8)
+
+
+def _high_depth_to_l(pil_img):
+    """将16位/32位整数或浮点灰度图转换为8位灰度图
+
+    PIL的 convert('RGB') 会把超出255的值直接截断；cv2.imread(IMREAD_COLOR) 则对16位图像
+    只保留高8位。整数图像按后者处理；浮点图像OpenCV无法以彩色模式读取，按最小/最大值归一化。
+
+    Args:
+        pil_img: 模式为 I;16*、I 或 F 的PIL.Image
+
+    Returns:
+        PIL.Image: L模式图像
+    """
+    data = np.asarray(pil_img)
+    if pil_img.mode == 'F':
+        low, high = float(data.min()), float(data.max())
+        scale = 255.0 / (high - low) if high > low else 0.0
+        data = np.rint((data - low) * scale)
+    else:
+        data = np.clip(data.astype(np.int64) >> 8, 0, 255)
+    return Image.fromarray(data.astype(np.uint8), 'L')
+
+
+def pil_to_bgr(pil_img):
+    """将PIL图像转换为BGR数组
+
+    Args:
+        pil_img: PIL.Image
+
+    Returns:
+        numpy.ndarray: BGR格式的图像
+    """
+    if pil_img.mode in ('I', 'F') or pil_img.mode.startswith('I;16'):
+        pil_img = _high_depth_to_l(pil_img)
+    if pil_img.mode != 'RGB':
+        pil_img = pil_img.convert('RGB')
+    return swap_rb(np.asarray(pil_img))
+
+
+def imread(path):
+    """读取图像文件（等价于 cv2.imread(path, cv2.IMREAD_COLOR)）
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        numpy.ndarray: BGR格式的图像，读取失败则返回None
+    """
+    try:
+        with Image.open(path) as pil_img:
+            return pil_to_bgr(pil_img)
+    except Exception:
+        return None
+
+
+def imdecode(data):
+    """解码内存中的图像数据（等价于 cv2.imdecode(buf, cv2.IMREAD_COLOR)）
+
+    Args:
+        data: 图像文件的字节数据
+
+    Returns:
+        numpy.ndarray: BGR格式的图像，解码失败则返回None
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as pil_img:
+            return pil_to_bgr(pil_img)
+    except Exception:
+        return None
@@ -0,0 +1,216 @@
+"""
+二维码模块渲染模块
+在持久的 PhotoImage 上按模块矩阵绘制二维码，相邻两帧之间只重绘发生变化的区域
+"""
+
+import time
+import tkinter as tk
+from collections import OrderedDict
+
+import numpy as np
+from PIL import ImageColor
+
+
+def find_dirty_rects(old_matrix, new_matrix):
+    """找出两帧模块矩阵之间发生变化的矩形区域
+
+    先对两帧做异或得到变化的模块，再按行把连续且新颜色相同的变化模块合并为横向线段，
+    最后把上下相邻、列范围和颜色都相同的线段合并为矩形。每个矩形只包含一种颜色，
+    可以用一次纯色填充完成重绘。
+
+    Args:
+        old_matrix: 上一帧的布尔矩阵
+        new_matrix: 当前帧的布尔矩阵（与上一帧形状相同）
+
+    Returns:
+        list: [(起始行, 起始列, 结束行, 结束列, 是否深色), ...]，结束行列不包含在内
+    """
+    changed = np.logical_xor(old_matrix, new_matrix)
+    rects = []
+    # (起始列, 结束列, 颜色) -> 起始行，记录延续到上一行的矩形
+    open_rects = {}
+
+    for row in range(changed.shape[0]):
+        row_runs = set()
+        cols = np.flatnonzero(changed[row])
+        if cols.size:
+            # 列号不连续或颜色变化的位置作为线段分界
+            colors = new_matrix[row, cols]
+            breaks = np.flatnonzero((np.diff(cols) != 1) | (np.diff(colors) != 0)) + 1
+            starts = np.concatenate(([0], breaks))
+            ends = np.concatenate((breaks, [cols.size]))
+            for start, end in zip(starts, ends):
+                row_runs.add((int(cols[start]), int(cols[end - 1]) + 1, bool(colors[start])))
+
+        # 未在本行延续的矩形到此结束
+        for key in list(open_rects):
+            if key not in row_runs:
+                col0, col1, dark = key
+                rects.append((open_rects.pop(key), col0, row, col1, dark))
+        for key in row_runs:
+            open_rects.setdefault(key, row)
+
+    for (col0, col1, dark), row0 in open_rects.items():
+        rects.append((row0, col0, changed.shape[0], col1, dark))
+    return rects
+
+
+def fit_module_scale(modules, width, height, max_scale=None):
+    """计算能完整放入指定区域的最大整数模块边长
+
+    Args:
+        modules: 每边的模块数（含静区）
+        width: 区域宽度（像素）
+        height: 区域高度（像素）
+        max_scale: 模块边长上限，可选
+
+    Returns:
+        int: 模块像素边长，至少为1
+    """
+    scale = min(width, height) // modules
+    if max_scale is not None:
+        scale = min(scale, max_scale)
+    return max(1, scale)
+
+
+def module_pixels(matrix, scale, fill_rgb, back_rgb):
+    """按模块矩阵生成放大后的RGB像素
+
+    Args:
+        matrix: 布尔模块矩阵，True表示深色模块
+        scale: 每个模块的像素边长
+        fill_rgb: 深色模块的 (R, G, B)
+        back_rgb: 浅色模块的 (R, G, B)
+
+    Returns:
+        numpy.ndarray: (高, 宽, 3) 的uint8数组
+    """
+    pixels = np.where(matrix[:, :, None],
+                      np.asarray(fill_rgb, dtype=np.uint8), np.asarray(back_rgb, dtype=np.uint8))
+    return np.repeat(np.repeat(pixels, scale, axis=0), scale, axis=1)
+
+
+class ModuleRenderer:
+    """二维码模块渲染类
+
+    每种显示尺寸各持有一个持久的 PhotoImage 及其上绘制的模块矩阵，最近使用的若干尺寸保留在缓存中。
+    新帧与该图像上的矩阵变化面积不超过阈值时，只用 PhotoImage.put 对变化的子矩形做纯色填充；
+    否则（或首次使用该尺寸时）整幅重绘。每个子矩形都是一次Tcl调用，矩形过多时同样整幅重绘。
+    窗口在几个尺寸之间来回调整时，切回缓存中的尺寸只需差分更新。
+    """
+
+    def __init__(self, master, fill_color="black", back_color="white",
+                 full_repaint_threshold=0.35, max_dirty_rects=128, cache_size=3, photo_factory=None):
+        """初始化
+
+        Args:
+            master: PhotoImage 所属的Tk组件
+            fill_color: 深色模块颜色
+            back_color: 浅色模块颜色
+            full_repaint_threshold: 变化面积占比超过该值时整幅重绘
+            max_dirty_rects: 变化矩形数量超过该值时整幅重绘
+            cache_size: 缓存的显示尺寸数量
+            photo_factory: 创建图像对象的函数，签名同 tk.PhotoImage，默认为 tk.PhotoImage
+        """
+        self.master = master
+        self.photo_factory = photo_factory or tk.PhotoImage
+        self.full_repaint_threshold = full_repaint_threshold
+        self.max_dirty_rects = max_dirty_rects
+        self.cache_size = max(1, cache_size)
+        # 颜色统一由PIL解析：Tk不认识的写法（如 rgb(0,0,0)）也能用于差分重绘
+        self._rgb = {
+            True: ImageColor.getrgb(fill_color)[:3],
+            False: ImageColor.getrgb(back_color)[:3],
+        }
+        self._colors = {dark: "#%02x%02x%02x" % rgb for dark, rgb in self._rgb.items()}
+        # (模块像素边长, 每边模块数) -> [PhotoImage, 图像上当前的模块矩阵]，按最近使用排序
+        self._bitmaps = OrderedDict()
+        self.photo = None
+        self.matrix = None
+        self.scale = None
+
+        # 统计信息
+        self.frames = 0
+        self.full_repaints = 0
+        self.total_repainted = 0.0
+        self.total_paint_time = 0.0
+
+    def render(self, matrix, scale):
+        """绘制一帧
+
+        Args:
+            matrix: 布尔模块矩阵，True表示深色模块
+            scale: 每个模块的像素边长（整数）
+
+        Returns:
+            tk.PhotoImage: 绘制后的图像（同一尺寸始终是同一个对象）
+        """
+        start = time.perf_counter()
+
+        key = (scale, matrix.shape[0])
+        entry = self._bitmaps.get(key)
+        if entry is None:
+            photo = self.photo_factory(master=self.master,
+                                       width=matrix.shape[1] * scale, height=matrix.shape[0] * scale)
+            entry = self._bitmaps[key] = [photo, None]
+            # 淘汰最久未使用的尺寸
+            while len(self._bitmaps) > self.cache_size:
+                self._bitmaps.popitem(last=False)
+        self._bitmaps.move_to_end(key)
+        photo, previous = entry
+
+        if previous is None or previous.shape != matrix.shape:
+            repainted = self._full_repaint(photo, matrix, scale)
+        else:
+            rects = find_dirty_rects(previous, matrix)
+            area = sum((row1 - row0) * (col1 - col0) for row0, col0, row1, col1, _ in rects)
+            repainted = area / matrix.size
+            if repainted > self.full_repaint_threshold or len(rects) > self.max_dirty_rects:
+                repainted = self._full_repaint(photo, matrix, scale)
+            else:
+                for row0, col0, row1, col1, dark in rects:
+                    photo.put(
+                        self._colors[dark],
+                        to=(col0 * scale, row0 * scale, col1 * scale, row1 * scale)
+                    )
+
+        entry[1] = matrix.copy()
+        self.photo, self.matrix, self.scale = photo, entry[1], scale
+        self.frames += 1
+        self.total_repainted += repainted
+        self.total_paint_time += time.perf_counter() - start
+        return self.photo
+
+    def _full_repaint(self, photo, matrix, scale):
+        """整幅重绘
+
+        Args:
+            photo: 目标图像
+            matrix: 布尔模块矩阵
+            scale: 每个模块的像素边长
+
+        Returns:
+            float: 重绘面积占比 (1.0)
+        """
+        height, width = matrix.shape[0] * scale, matrix.shape[1] * scale
+
+        # 按模块着色后放大为像素，以二进制PPM数据一次性写入
+        pixels = module_pixels(matrix, scale, self._rgb[True], self._rgb[False])
+        header = f"P6 {width} {height} 255\n".encode("ascii")
+        photo.put(header + pixels.tobytes(), to=(0, 0))
+
+        self.full_repaints += 1
+        return 1.0
+
+    def stats(self):
+        """统计信息
+
+        Returns:
+            dict: (frames, full_repaints, avg_repainted, avg_paint_ms)
+        """
+        return {
+            "frames": self.frames,
+            "full_repaints": self.full_repaints,
+            "avg_repainted": self.total_repainted / self.frames if self.frames else 0.0,
+            "avg_paint_ms": self.total_paint_time / self.frames * 1000 if self.frames else 0.0,
+        }
@@ -0,0 +1,236 @@
+"""
+性能分析工具模块
+按需对运行中的程序进行定时采样分析，输出 .pstats 和火焰图所需的折叠栈文件
+"""
+
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+
+def _thread_cpu_time(ident):
+    """获取指定线程已消耗的CPU时间
+
+    Args:
+        ident: 线程标识 (threading.get_ident)
+
+    Returns:
+        float: CPU时间（秒），当前平台不支持时返回None
+    """
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError, OverflowError):
+        return None
+
+
+class ProfileCapture:
+    """定时采样分析类
+
+    cProfile 的钩子只作用于调用 enable() 的线程（Python 3.12 起则独占全局钩子），
+    无法在不重启的情况下同时覆盖生成线程和Tk线程。因此这里用一个后台线程定期读取
+    sys._current_frames() 对所有线程采样：未开启时没有任何钩子和线程，开销为零。
+    支持线程CPU时钟的平台上，只记录两次采样之间确实消耗了CPU的线程，空闲等待不计入热点，
+    每个样本按该线程在两次采样之间消耗的CPU时间计时；否则按实测的采样间隔计时。
+    """
+
+    def __init__(self, output_dir="profiles", sample_interval=0.005):
+        """初始化
+
+        Args:
+            output_dir: 输出目录
+            sample_interval: 采样间隔（秒）
+        """
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.active = False
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._samples = Counter()
+        self._sample_times = Counter()
+        self._on_finish = None
+        self.result = None
+
+    def start(self, duration, on_finish=None):
+        """开始采样
+
+        Args:
+            duration: 采样时长（秒）
+            on_finish: 完成回调 on_finish(result)，在采样线程中调用，可选
+
+        Returns:
+            bool: 是否成功开始（已在采样时返回False）
+        """
+        if self.active:
+            return False
+
+        self.active = True
+        self.result = None
+        self._samples = Counter()
+        self._sample_times = Counter()
+        self._on_finish = on_finish
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._sample_loop, args=(duration,), name="profiler", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """提前结束采样，结果仍会写出并回调"""
+        self._stop_event.set()
+
+    def wait(self):
+        """等待采样结束
+
+        Returns:
+            dict: 采样结果，未开始过采样时返回None
+        """
+        if self._thread is not None:
+            self._thread.join()
+        return self.result
+
+    def _sample_loop(self, duration):
+        """采样线程主循环"""
+        own_ident = threading.get_ident()
+        deadline = time.monotonic() + duration
+        started = time.monotonic()
+        cpu_times = {}
+        last_tick = started
+
+        while not self._stop_event.wait(self.sample_interval):
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            # GIL切换和遍历调用栈使实际采样间隔远大于名义间隔，不能按名义间隔计时
+            tick_time = now - last_tick
+            last_tick = now
+
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+
+                # 跳过两次采样之间没有消耗CPU的线程；样本按该线程实际消耗的CPU时间计时，
+                # 多个线程争用GIL时不会重复计入同一段时间。不支持线程CPU时钟时按实测采样间隔计时
+                weight = tick_time
+                cpu_time = _thread_cpu_time(ident)
+                if cpu_time is not None:
+                    last = cpu_times.get(ident)
+                    cpu_times[ident] = cpu_time
+                    if last is None or cpu_time <= last:
+                        continue
+                    weight = cpu_time - last
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.reverse()
+                key = (thread_names.get(ident, str(ident)), tuple(stack))
+                self._samples[key] += 1
+                self._sample_times[key] += weight
+
+        self.result = self._write_results(time.monotonic() - started)
+        self.active = False
+        if self._on_finish:
+            self._on_finish(self.result)
+
+    def _write_results(self, elapsed):
+        """写出 .pstats 和折叠栈文件
+
+        Args:
+            elapsed: 实际采样时长（秒）
+
+        Returns:
+            dict: (pstats_path, collapsed_path, samples, elapsed, top)
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(self.output_dir, datetime.now().strftime("profile_%Y%m%d_%H%M%S"))
+        pstats_path = prefix + ".pstats"
+        collapsed_path = prefix + ".collapsed"
+
+        stats = self._build_pstats()
+        with open(pstats_path, "wb") as f:
+            marshal.dump(stats, f)
+
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            for (thread_name, stack), count in self._samples.most_common():
+                frames = [thread_name] + [
+                    f"{name} ({os.path.basename(filename)}:{lineno})"
+                    for filename, lineno, name in stack
+                ]
+                f.write(";".join(frames) + f" {count}\n")
+
+        return {
+            "pstats_path": pstats_path,
+            "collapsed_path": collapsed_path,
+            "samples": sum(self._samples.values()),
+            "elapsed": elapsed,
+            "top": self.top_functions(stats),
+        }
+
+    def _build_pstats(self):
+        """将采样结果转换为 pstats 可读取的统计字典
+
+        调用次数记为采样次数，自身耗时和累计耗时为各样本所计时间（线程CPU时间或实测采样间隔）之和。
+
+        Returns:
+            dict: {(文件, 行号, 函数名): (cc, nc, tt, ct, callers)}
+        """
+        stats = {}
+
+        def entry(func):
+            if func not in stats:
+                stats[func] = [0, 0, 0.0, 0.0, {}]
+            return stats[func]
+
+        for key, count in self._samples.items():
+            _, stack = key
+            if not stack:
+                continue
+            elapsed = self._sample_times[key]
+
+            leaf = entry(stack[-1])
+            leaf[2] += elapsed
+
+            # 递归调用的函数在一次采样中只计一次累计耗时
+            for func in set(stack):
+                item = entry(func)
+                item[0] += count
+                item[1] += count
+                item[3] += elapsed
+
+            for caller, callee in set(zip(stack, stack[1:])):
+                callers = entry(callee)[4]
+                cc, nc, tt, ct = callers.get(caller, (0, 0, 0.0, 0.0))
+                callers[caller] = (cc + count, nc + count, tt, ct + elapsed)
+
+        return {func: (cc, nc, tt, ct, callers) for func, (cc, nc, tt, ct, callers) in stats.items()}
+
+    @staticmethod
+    def top_functions(stats, limit=5):
+        """按自身耗时排序的热点函数
+
+        Args:
+            stats: _build_pstats 返回的统计字典
+            limit: 返回数量
+
+        Returns:
+            list: ["函数名 (文件:行号) 占比", ...]
+        """
+        total = sum(value[2] for value in stats.values())
+        if total <= 0:
+            return []
+        ranked = sorted(
+            (item for item in stats.items() if item[1][2] > 0),
+            key=lambda item: item[1][2], reverse=True
+        )[:limit]
+        return [
+            f"{name} ({os.path.basename(filename)}:{lineno}) {value[2] / total:.0%}"
+            for (filename, lineno, name), value in ranked
+        ]
@@ -6,26 +6,32 @@
 from datetime import datetime, timedelta
 import pytz
 
-from QRSignSimulator.config.settings import TIME_ZONE, UPDATE_INTERVAL
+from QRSignSimulator.config.settings import DEFAULT_SETTINGS
 
 
 class TimeManager:
     """时间管理类"""
     
-    @staticmethod
-    def get_beijing_time():
+    def __init__(self, settings=None):
+        """初始化
+        
+        Args:
+            settings: 设置对象 (Settings)，默认使用 DEFAULT_SETTINGS
+        """
+        self.settings = settings or DEFAULT_SETTINGS
+        self._time_zone = pytz.timezone(self.settings.time_zone)
+    
+    def get_beijing_time(self):
         """获取北京时间
         
         Returns:
             datetime: 无时区信息的北京时间
         """
-        beijing_tz = pytz.timezone(TIME_ZONE)
         # 返回无时区信息的时间
-        now = datetime.now(beijing_tz)
+        now = datetime.now(self._time_zone)
         return now.replace(tzinfo=None)
     
-    @staticmethod
-    def calculate_target_time(original_time, current_time=None):
+    def calculate_target_time(self, original_time, current_time=None):
         """计算目标时间（最接近当前时间的指定间隔倍数）
         
         Args:
@@ -36,18 +42,19 @@ class TimeManager:
             tuple: (目标时间, 下一个目标时间, 倒计时秒数)
         """
         if current_time is None:
-            current_time = TimeManager.get_beijing_time()
+            current_time = self.get_beijing_time()
         
         # 计算从原始时间开始，最接近当前时间的间隔倍数
+        update_interval = self.settings.update_interval
         time_diff = (current_time - original_time).total_seconds()
-        # 向下取整到最近的间隔倍数
-        adjusted_diff = int(time_diff // UPDATE_INTERVAL * UPDATE_INTERVAL)
+        # 向下取整到最近的间隔倍数（间隔可以是小数秒，不能再截断为整数秒）
+        adjusted_diff = time_diff // update_interval * update_interval
         
         # 计算目标时间
         target_time = original_time + timedelta(seconds=adjusted_diff)
         
         # 计算下一个间隔倍数的时间
-        next_target = original_time + timedelta(seconds=adjusted_diff + UPDATE_INTERVAL)
+        next_target = original_time + timedelta(seconds=adjusted_diff + update_interval)
         
         # 计算到下一个目标时间的倒计时
         seconds_to_next = max(0, (next_target - current_time).total_seconds())
@@ -2,7 +2,9 @@
 动态签到码模拟生成器主入口文件
 """
 
+import sys
+
 from QRSignSimulator.app import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file